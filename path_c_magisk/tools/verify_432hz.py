@@ -21,6 +21,7 @@ import argparse
 import json
 import math
 import sys
+from functools import lru_cache
 from pathlib import Path
 
 
@@ -39,9 +40,25 @@ def load_audio(path: str):
     """Load audio file, return (samples_float32, sample_rate)."""
     try:
         import soundfile as sf
-        data, sr = sf.read(path, dtype="float32", always_2d=True)
-        # Mix to mono for pitch analysis
-        mono = data.mean(axis=1)
+        import numpy as np
+        # Read integer PCM as int16 (half the footprint of float32); the
+        # downmix accumulates in float32 and a single scale converts at the
+        # end. Float-encoded files keep the float32 path to avoid clipping.
+        # Mono files skip the downmix pass entirely.
+        info = sf.info(path)
+        if info.subtype in ("PCM_16", "PCM_U8", "PCM_S8"):
+            data, sr = sf.read(path, dtype="int16", always_2d=True)
+            if info.channels == 1:
+                mono = data[:, 0].astype(np.float32)
+            else:
+                mono = data.mean(axis=1, dtype=np.float32)
+            mono *= np.float32(1.0 / 32768.0)
+        else:
+            if info.channels == 1:
+                return sf.read(path, dtype="float32")
+            data, sr = sf.read(path, dtype="float32", always_2d=True)
+            # Mix to mono for pitch analysis
+            mono = data.mean(axis=1)
         return mono, sr
     except ImportError:
         pass
@@ -62,35 +79,79 @@ def load_audio(path: str):
         sys.exit(1)
 
 
-def fft_peak_frequency(samples, sample_rate: int, window_sec: float = 2.0) -> dict:
+@lru_cache(maxsize=8)
+def _hann_window(n: int):
+    """Cached float32 Hann window — analyze() reuses the same n repeatedly."""
+    import numpy as np
+    return np.hanning(n).astype(np.float32)
+
+
+def _shared_spectrum(samples, sample_rate: int, window_sec: float = 2.0):
+    """
+    One rfft of the Hann-windowed leading chunk, padded far enough (2n-1)
+    that both the FFT peak pick and the autocorrelation can be derived
+    from it. Returns (spectrum, fft_size, n).
+    """
+    import numpy as np
+
+    n = min(int(window_sec * sample_rate), len(samples))
+    windowed = np.multiply(samples[:n], _hann_window(n),
+                           out=np.empty(n, dtype=samples.dtype))
+    try:
+        import scipy.fft as sfft
+        fft_size = sfft.next_fast_len(2 * n - 1, real=True)
+        spectrum = sfft.rfft(windowed, n=fft_size, workers=-1)
+    except ImportError:
+        fft_size = 1 << (2 * n - 2).bit_length()
+        spectrum = np.fft.rfft(windowed, n=fft_size)
+    return spectrum, fft_size, n
+
+
+def fft_peak_frequency(samples, sample_rate: int, window_sec: float = 2.0,
+                       spectrum=None) -> dict:
     """
     Find the peak frequency in the first `window_sec` of audio via FFT.
 
+    Pass `spectrum` (a `_shared_spectrum` result) to reuse an
+    already-computed transform instead of running a fresh one.
+
     Returns a dict with peak_hz, magnitude, and the frequency bins.
     """
     import numpy as np
 
-    n = min(int(window_sec * sample_rate), len(samples))
-    chunk = samples[:n]
+    if spectrum is None:
+        n = min(int(window_sec * sample_rate), len(samples))
+        chunk = samples[:n]
+
+        # Apply Hann window to reduce spectral leakage. Both operands are
+        # float32, so the transform stays single-precision (complex64 out of
+        # scipy's rfft) — half the memory traffic of a float64 pipeline.
+        window = _hann_window(n)
+        windowed = np.multiply(chunk, window, out=np.empty_like(chunk))
 
-    # Apply Hann window to reduce spectral leakage
-    window = np.hanning(n)
-    windowed = chunk * window
+        # Zero-pad to a fast composite FFT size (typically a few % above n,
+        # vs up to ~2x for the next power of 2)
+        try:
+            import scipy.fft as sfft
+            fft_size = sfft.next_fast_len(n, real=True)
+            spec = sfft.rfft(windowed, n=fft_size, workers=-1)
+        except ImportError:
+            fft_size = 1 << (n - 1).bit_length()   # next power of 2
+            spec = np.fft.rfft(windowed, n=fft_size)
+    else:
+        spec, fft_size, n = spectrum
 
-    # Zero-pad to next power-of-2 for efficiency
-    fft_size = 1 << (n - 1).bit_length()   # next power of 2
-    spectrum = np.fft.rfft(windowed, n=fft_size)
-    magnitudes = np.abs(spectrum)
     freqs = np.fft.rfftfreq(fft_size, d=1.0 / sample_rate)
+    magnitudes = np.abs(spec)
 
-    # Focus on 300–600 Hz band (where 432/440 sit)
-    band_mask = (freqs >= 300) & (freqs <= 600)
-    if not band_mask.any():
+    # Focus on 300–600 Hz band (where 432/440 sit): argmax over the band
+    # slice directly instead of masking and copying the full spectrum
+    lo = math.ceil(300 * fft_size / sample_rate)
+    hi = min(int(600 * fft_size / sample_rate) + 1, len(magnitudes))
+    if lo >= hi:
         peak_idx = np.argmax(magnitudes)
     else:
-        band_mags = magnitudes.copy()
-        band_mags[~band_mask] = 0
-        peak_idx = np.argmax(band_mags)
+        peak_idx = lo + np.argmax(magnitudes[lo:hi])
 
     peak_hz = freqs[peak_idx]
     peak_mag = magnitudes[peak_idx]
@@ -100,7 +161,8 @@ def fft_peak_frequency(samples, sample_rate: int, window_sec: float = 2.0) -> di
         alpha = magnitudes[peak_idx - 1]
         beta  = magnitudes[peak_idx]
         gamma = magnitudes[peak_idx + 1]
-        p = 0.5 * (alpha - gamma) / (alpha - 2 * beta + gamma + 1e-12)
+        denom = alpha - 2 * beta + gamma
+        p = 0.5 * (alpha - gamma) / denom if denom != 0.0 else 0.0
         bin_resolution = sample_rate / fft_size
         peak_hz = peak_hz + p * bin_resolution
 
@@ -110,22 +172,164 @@ def fft_peak_frequency(samples, sample_rate: int, window_sec: float = 2.0) -> di
         "freqs":          freqs,
         "magnitudes":     magnitudes,
         "bin_resolution": float(sample_rate / fft_size),
+        "window_samples": n,
+    }
+
+
+def _acf_peak_lag_py(acf, lag_min: int, lag_max: int) -> float:
+    """Find the ACF peak lag in [lag_min, lag_max) with parabolic refinement."""
+    import numpy as np
+    peak = int(np.argmax(acf[lag_min:lag_max])) + lag_min
+    if 0 < peak < len(acf) - 1:
+        alpha = float(acf[peak - 1])
+        beta  = float(acf[peak])
+        gamma = float(acf[peak + 1])
+        denom = alpha - 2.0 * beta + gamma
+        if denom != 0.0:
+            return peak + 0.5 * (alpha - gamma) / denom
+    return float(peak)
+
+
+try:
+    # Optional: fuse argmax + parabolic interpolation into one compiled pass
+    from numba import njit
+
+    @njit(cache=True, fastmath=True)
+    def _acf_peak_lag_jit(acf, lag_min, lag_max):
+        peak = lag_min
+        best = acf[lag_min]
+        for i in range(lag_min + 1, lag_max):
+            if acf[i] > best:
+                best = acf[i]
+                peak = i
+        if 0 < peak < len(acf) - 1:
+            alpha = acf[peak - 1]
+            beta  = acf[peak]
+            gamma = acf[peak + 1]
+            denom = alpha - 2.0 * beta + gamma
+            if denom != 0.0:
+                return peak + 0.5 * (alpha - gamma) / denom
+        return float(peak)
+
+    _acf_peak_lag = _acf_peak_lag_jit
+except ImportError:
+    _acf_peak_lag = _acf_peak_lag_py
+
+
+try:
+    import numpy as _np
+    from numba import njit as _njit, prange as _prange
+
+    @_njit(cache=True, fastmath=True, parallel=True)
+    def _goertzel_bank(chunk, coeffs):
+        """Goertzel power at each bin: 2 mults + 1 add per sample per bin."""
+        n_bins = len(coeffs)
+        power = _np.empty(n_bins, dtype=_np.float64)
+        for b in _prange(n_bins):
+            coeff = coeffs[b]
+            s_prev = 0.0
+            s_prev2 = 0.0
+            for x in chunk:
+                s = x + coeff * s_prev - s_prev2
+                s_prev2 = s_prev
+                s_prev = s
+            power[b] = s_prev * s_prev + s_prev2 * s_prev2 - coeff * s_prev * s_prev2
+        return power
+except ImportError:
+    _goertzel_bank = None
+
+
+def goertzel_peak_frequency(samples, sample_rate: int, window_sec: float = 2.0,
+                            f_lo: float = 300.0, f_hi: float = 600.0,
+                            resolution: float = 0.5) -> dict:
+    """
+    Find the peak frequency in the 300–600 Hz band by evaluating the DFT
+    only at the bins of interest (Goertzel bank) — no full-spectrum FFT.
+
+    Returns the same dict shape as `fft_peak_frequency`.
+    """
+    import numpy as np
+
+    n = min(int(window_sec * sample_rate), len(samples))
+    chunk = np.multiply(samples[:n], _hann_window(n), out=np.empty(n, dtype=np.float32))
+
+    freqs = np.arange(f_lo, f_hi + resolution, resolution, dtype=np.float64)
+    omegas = 2.0 * math.pi * freqs / sample_rate
+
+    if _goertzel_bank is not None:
+        power = _goertzel_bank(chunk.astype(np.float64), 2.0 * np.cos(omegas))
+    else:
+        # numpy fallback: blocked band DFT (BLAS matrix-vector products)
+        acc_cos = np.zeros(len(freqs))
+        acc_sin = np.zeros(len(freqs))
+        x = chunk.astype(np.float64)
+        block = 8192
+        for start in range(0, n, block):
+            t = np.arange(start, min(start + block, n), dtype=np.float64)
+            phases = np.outer(omegas, t)
+            xb = x[start:start + block]
+            acc_cos += np.cos(phases) @ xb
+            acc_sin += np.sin(phases) @ xb
+        power = acc_cos * acc_cos + acc_sin * acc_sin
+
+    magnitudes = np.sqrt(power)
+    peak_idx = int(np.argmax(magnitudes))
+    peak_hz = freqs[peak_idx]
+    peak_mag = magnitudes[peak_idx]
+
+    # Refine with quadratic interpolation on the 0.5 Hz grid
+    if 0 < peak_idx < len(magnitudes) - 1:
+        alpha = magnitudes[peak_idx - 1]
+        beta  = magnitudes[peak_idx]
+        gamma = magnitudes[peak_idx + 1]
+        denom = alpha - 2 * beta + gamma
+        p = 0.5 * (alpha - gamma) / denom if denom != 0.0 else 0.0
+        peak_hz = peak_hz + p * resolution
+
+    return {
+        "peak_hz":        float(peak_hz),
+        "magnitude":      float(peak_mag),
+        "freqs":          freqs,
+        "magnitudes":     magnitudes,
+        "bin_resolution": float(resolution),
+        "window_samples": n,
     }
 
 
-def harmonic_pitch_estimate(samples, sample_rate: int) -> float:
+def harmonic_pitch_estimate(samples, sample_rate: int, spectrum=None) -> float:
     """
     Estimate fundamental pitch using autocorrelation (HPS-like method).
     More robust than raw FFT peak for complex audio.
+
+    Pass `spectrum` (a `_shared_spectrum` result) to derive the
+    autocorrelation from an already-computed transform.
     """
     import numpy as np
+    try:
+        import scipy.fft as sfft
+    except ImportError:
+        sfft = None
 
-    n = min(int(2.0 * sample_rate), len(samples))
-    chunk = samples[:n]
-
-    # Autocorrelation via FFT
-    spec = np.fft.rfft(chunk, n=2 * n)
-    acf = np.fft.irfft(spec * spec.conj())[:n]
+    if spectrum is not None:
+        spec, size, n = spectrum
+    else:
+        n = min(int(2.0 * sample_rate), len(samples))
+        chunk = samples[:n]
+        if sfft is not None:
+            size = sfft.next_fast_len(2 * n - 1, real=True)
+            spec = sfft.rfft(chunk, n=size, workers=-1)
+        else:
+            size = 1 << (2 * n - 2).bit_length()
+            spec = np.fft.rfft(chunk, n=size)
+
+    # Autocorrelation via FFT (Wiener–Khinchin, padded to a fast size ≥ 2n-1).
+    # |X|² is computed as real²+imag² — a real power spectrum, avoiding the
+    # complex product spec*conj(spec) whose imaginary part is discarded anyway.
+    power = spec.real * spec.real + spec.imag * spec.imag
+    if sfft is not None:
+        acf = sfft.irfft(power, n=size, workers=-1)[:n]
+    else:
+        acf = np.fft.irfft(power, n=size)[:n]
 
     # Search in the 300–600 Hz range (lag range)
     lag_min = int(sample_rate / 600.0)
@@ -133,8 +337,8 @@ def harmonic_pitch_estimate(samples, sample_rate: int) -> float:
     if lag_min >= lag_max or lag_max >= len(acf):
         return 0.0
 
-    peak_lag = np.argmax(acf[lag_min:lag_max]) + lag_min
-    return float(sample_rate) / float(peak_lag) if peak_lag > 0 else 0.0
+    peak_lag = _acf_peak_lag(acf, lag_min, lag_max)
+    return float(sample_rate) / peak_lag if peak_lag > 0 else 0.0
 
 
 def detect_pitch_librosa(samples, sample_rate: int) -> float:
@@ -166,6 +370,12 @@ def cents_from_hz(measured: float, reference: float) -> float:
     return semitones_from_hz(measured, reference) * 100.0
 
 
+def _semi_and_cents(measured: float, reference: float):
+    """One log2 for both units — cents are just semitones × 100."""
+    semis = semitones_from_hz(measured, reference)
+    return semis, semis * 100.0
+
+
 # ─── Main Analysis ────────────────────────────────────────────────────────────
 
 def analyze(args) -> dict:
@@ -186,15 +396,21 @@ def analyze(args) -> dict:
         "verdict":       "UNKNOWN",
     }
 
-    # ── Method 1: FFT peak ────────────────────────────────────────────────────
+    # ── Method 1: FFT peak (or Goertzel band scan with --goertzel) ────────────
 
-    fft_result = fft_peak_frequency(samples, sample_rate)
+    peak_fn = goertzel_peak_frequency if args.goertzel else fft_peak_frequency
+    if args.goertzel:
+        shared = None
+        fft_result = peak_fn(samples, sample_rate)
+    else:
+        # One transform feeds both the FFT peak and the autocorrelation
+        shared = _shared_spectrum(samples, sample_rate)
+        fft_result = fft_peak_frequency(samples, sample_rate, spectrum=shared)
     fft_hz = fft_result["peak_hz"]
-    fft_semitones = semitones_from_hz(fft_hz, INPUT_HZ_DEFAULT)
-    fft_cents = cents_from_hz(fft_hz, INPUT_HZ_DEFAULT)
+    fft_semitones, fft_cents = _semi_and_cents(fft_hz, INPUT_HZ_DEFAULT)
 
     results["measurements"]["fft_peak"] = {
-        "method":       "FFT windowed peak",
+        "method":       "Goertzel band peak" if args.goertzel else "FFT windowed peak",
         "measured_hz":  round(fft_hz, 3),
         "semitones":    round(fft_semitones, 4),
         "cents":        round(fft_cents, 2),
@@ -205,10 +421,9 @@ def analyze(args) -> dict:
 
     # ── Method 2: Autocorrelation ─────────────────────────────────────────────
 
-    acf_hz = harmonic_pitch_estimate(samples, sample_rate)
+    acf_hz = harmonic_pitch_estimate(samples, sample_rate, spectrum=shared)
     if acf_hz > 0:
-        acf_semitones = semitones_from_hz(acf_hz, INPUT_HZ_DEFAULT)
-        acf_cents = cents_from_hz(acf_hz, INPUT_HZ_DEFAULT)
+        acf_semitones, acf_cents = _semi_and_cents(acf_hz, INPUT_HZ_DEFAULT)
         results["measurements"]["autocorrelation"] = {
             "method":      "Autocorrelation (HPS)",
             "measured_hz": round(acf_hz, 3),
@@ -218,11 +433,13 @@ def analyze(args) -> dict:
         print(f"  Autocorrelation:  {acf_hz:.2f} Hz  ({acf_semitones:+.4f} semitones, {acf_cents:+.1f}¢)")
 
     # ── Method 3: librosa pyin (optional) ─────────────────────────────────────
+    # pyin dominates runtime (seconds per call), so it only runs when asked
+    # for explicitly or as a tiebreaker when FFT and ACF disagree.
 
-    pyin_hz = detect_pitch_librosa(samples, sample_rate)
+    need_tiebreak = acf_hz > 0 and abs(fft_hz - acf_hz) > args.tolerance
+    pyin_hz = detect_pitch_librosa(samples, sample_rate) if (args.use_pyin or need_tiebreak) else 0.0
     if pyin_hz > 0:
-        pyin_semitones = semitones_from_hz(pyin_hz, INPUT_HZ_DEFAULT)
-        pyin_cents = cents_from_hz(pyin_hz, INPUT_HZ_DEFAULT)
+        pyin_semitones, pyin_cents = _semi_and_cents(pyin_hz, INPUT_HZ_DEFAULT)
         results["measurements"]["librosa_pyin"] = {
             "method":      "librosa pyin (probabilistic YIN)",
             "measured_hz": round(pyin_hz, 3),
@@ -242,8 +459,7 @@ def analyze(args) -> dict:
     consensus_hz = float(np.median(measured_values))
     shift_hz     = abs(consensus_hz - INPUT_HZ_DEFAULT)
     error_hz     = abs(consensus_hz - args.expected)
-    shift_semis  = semitones_from_hz(consensus_hz, INPUT_HZ_DEFAULT)
-    shift_cents  = cents_from_hz(consensus_hz, INPUT_HZ_DEFAULT)
+    shift_semis, shift_cents = _semi_and_cents(consensus_hz, INPUT_HZ_DEFAULT)
 
     results["consensus"] = {
         "measured_hz":      round(consensus_hz, 3),
@@ -281,14 +497,29 @@ def analyze(args) -> dict:
     if args.plot:
         try:
             import matplotlib.pyplot as plt
-            fft_data = fft_peak_frequency(samples, sample_rate, window_sec=min(duration_s, 3.0))
-            freqs_plot = fft_data["freqs"]
-            mags_plot  = fft_data["magnitudes"]
+            # Reuse the spectrum already computed for Method 1; recompute only
+            # when the plot window actually differs from the analysis window
+            plot_sec = min(duration_s, 3.0)
+            if min(int(plot_sec * sample_rate), len(samples)) != fft_result["window_samples"]:
+                fft_result = peak_fn(samples, sample_rate, window_sec=plot_sec)
+            freqs_plot = fft_result["freqs"]
+            mags_plot  = fft_result["magnitudes"]
 
             # Focus on 300–600 Hz window
             mask = (freqs_plot >= 300) & (freqs_plot <= 600)
+            band_freqs = freqs_plot[mask]
+            band_mags  = mags_plot[mask]
+
+            # Max-pool down to ≤2048 points before the dB conversion — long
+            # files yield far more bins than the plot has pixels
+            if len(band_mags) > 2048:
+                pool = -(-len(band_mags) // 2048)   # ceil division
+                trimmed = len(band_mags) - (len(band_mags) % pool)
+                band_mags  = band_mags[:trimmed].reshape(-1, pool).max(axis=1)
+                band_freqs = band_freqs[:trimmed:pool]
+
             plt.figure(figsize=(10, 4))
-            plt.plot(freqs_plot[mask], 20 * np.log10(mags_plot[mask] + 1e-12))
+            plt.plot(band_freqs, 20 * np.log10(band_mags + 1e-12))
             plt.axvline(INPUT_HZ_DEFAULT, color="r", linestyle="--", label="440 Hz (input)")
             plt.axvline(args.expected,    color="g", linestyle="--", label=f"{args.expected} Hz (expected)")
             plt.axvline(consensus_hz,     color="b", linestyle="-",  label=f"{consensus_hz:.1f} Hz (measured)")
@@ -317,6 +548,8 @@ def main():
     parser.add_argument("--expected",     type=float, default=EXPECTED_HZ_DEFAULT,  help="Expected frequency (default: 432.0)")
     parser.add_argument("--tolerance",    type=float, default=TOLERANCE_HZ_DEFAULT, help="Pass/fail tolerance in Hz (default: 2.0)")
     parser.add_argument("--report", "-r", default=None, help="Save JSON report to file")
+    parser.add_argument("--use-pyin",     action="store_true", help="Always run librosa pyin (slow; otherwise only used as a tiebreaker)")
+    parser.add_argument("--goertzel",     action="store_true", help="Use a Goertzel band scan instead of a full FFT for Method 1")
     parser.add_argument("--plot",   "-p", action="store_true", help="Save spectrum plot as PNG")
     args = parser.parse_args()
 
@@ -331,8 +564,13 @@ def main():
         for m in results.get("measurements", {}).values():
             m.pop("freqs", None)
             m.pop("magnitudes", None)
-        with open(args.report, "w") as f:
-            json.dump(results, f, indent=2)
+        try:
+            import orjson
+            with open(args.report, "wb") as f:
+                f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2, default=str))
+        except ImportError:
+            with open(args.report, "w") as f:
+                json.dump(results, f, indent=2)
         print(f"\n  Report saved: {args.report}")
 
     sys.exit(0 if results["verdict"] == "PASS" else 1)
@@ -24,12 +24,19 @@
 import sys
 import json
 import re
+import gzip
+import array
 import argparse
+import numpy as np
 from pathlib import Path
 from dataclasses import dataclass, asdict
 from typing import Dict, List, Optional, Set
 from collections import defaultdict
 
+# Stack frame: function name followed by '(' (module/offset). Bytes mode —
+# lines are matched undecoded and only matching frame names pay for a decode.
+_FRAME_RE = re.compile(rb'^\s*([A-Za-z_]\w+(?:::\w+)*)\s*\(')
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Data structures
 # ─────────────────────────────────────────────────────────────────────────────
@@ -64,67 +71,77 @@ class PerformanceAnalyzer:
         print(f"[INFO] Parsing perf output: {self.perf_file}")
 
         try:
-            with open(self.perf_file, 'r') as f:
-                lines = f.readlines()
-
-            # Track function call statistics
-            functions = defaultdict(lambda: {
-                'count': 0,
-                'times': [],
-                'parents': set(),
-                'children': set()
-            })
-
-            # Simple parsing: extract function names from stack traces
-            # Format: function_name (overhead)
-            current_stack = []
-
-            for line in lines:
-                line = line.strip()
-
-                # Detect stack frame
-                if line and not line.startswith('#') and not line.startswith(';'):
-                    # Extract function name (usually until first space or paren)
-                    match = re.match(r'^\s*([a-zA-Z_]\w+(?:::\w+)*)\s*\(', line)
-                    if not match:
-                        # Fallback: take first word
-                        parts = line.split()
-                        if parts:
-                            func_name = parts[0].rstrip('();')
-                            if func_name and func_name not in ['cpu-cycles', 'cpu-clock']:
-                                current_stack.append(func_name)
-                    else:
-                        func_name = match.group(1)
-                        current_stack.append(func_name)
-
-                # Stack trace separator (empty line or new sample)
-                elif line == '' and current_stack:
-                    # Process completed stack
-                    for i, func in enumerate(current_stack):
-                        functions[func]['count'] += 1
-                        if i > 0:
-                            functions[func]['parents'].add(current_stack[i-1])
-                        if i < len(current_stack) - 1:
-                            functions[func]['children'].add(current_stack[i+1])
-                    current_stack = []
+            # Track function call statistics. Functions are interned to int
+            # ids and call-graph edges accumulate in flat int arrays —
+            # contiguous appends instead of one hash-set insert per frame.
+            name_to_id: Dict[str, int] = {}
+            names: List[str] = []
+            counts = array.array('i')
+            edge_parent = array.array('i')
+            edge_child = array.array('i')
+
+            def intern(name: str) -> int:
+                fid = name_to_id.get(name)
+                if fid is None:
+                    fid = name_to_id[name] = len(names)
+                    names.append(name)
+                    counts.append(0)
+                return fid
+
+            def flush(stack):
+                for fid in stack:
+                    counts[fid] += 1
+                for i in range(1, len(stack)):
+                    edge_parent.append(stack[i - 1])
+                    edge_child.append(stack[i])
+
+            # Stream line-by-line (O(longest line) memory, not O(filesize));
+            # perf script separates samples with blank lines. Compressed
+            # dumps are handled transparently.
+            opener = gzip.open if self.perf_file.suffix == '.gz' else open
+            total_lines = 0
+            stack = []
+            with opener(self.perf_file, 'rb') as f:
+                for line in f:
+                    total_lines += 1
+                    m = _FRAME_RE.match(line)
+                    if m:
+                        stack.append(intern(m.group(1).decode('ascii', 'replace')))
+                    elif not line.strip() and stack:
+                        flush(stack)
+                        stack = []
+            if stack:
+                flush(stack)
+
+            # Deduplicate edges once at the end (np.unique on (parent, child)
+            # pairs) and expand back to per-function name lists.
+            parent_names = defaultdict(list)
+            child_names = defaultdict(list)
+            if edge_parent:
+                pairs = np.unique(np.stack([np.frombuffer(edge_parent, dtype=np.int32),
+                                            np.frombuffer(edge_child, dtype=np.int32)],
+                                           axis=1), axis=0)
+                for parent_id, child_id in pairs:
+                    parent_names[int(child_id)].append(names[parent_id])
+                    child_names[int(parent_id)].append(names[child_id])
 
             # Convert to metrics
-            for func_name, data in functions.items():
-                if data['count'] > 0:
-                    # Estimate time: assume equal distribution across call stack
-                    avg_time = 1.0  # 1ms per sample (would be more accurate with actual timestamps)
-                    total_time = data['count'] * avg_time
-
-                    self.metrics[func_name] = FunctionMetrics(
-                        name=func_name,
-                        total_time_ms=total_time,
-                        cpu_percentage=(data['count'] / len(lines)) * 100 if lines else 0,
-                        call_count=data['count'],
-                        avg_time_ms=avg_time,
-                        max_time_ms=total_time,
-                        parent_functions=list(data['parents']),
-                        child_functions=list(data['children'])
-                    )
+            for fid, func_name in enumerate(names):
+                count = counts[fid]
+                # Estimate time: assume equal distribution across call stack
+                avg_time = 1.0  # 1ms per sample (would be more accurate with actual timestamps)
+                total_time = count * avg_time
+
+                self.metrics[func_name] = FunctionMetrics(
+                    name=func_name,
+                    total_time_ms=total_time,
+                    cpu_percentage=(count / total_lines) * 100 if total_lines else 0,
+                    call_count=count,
+                    avg_time_ms=avg_time,
+                    max_time_ms=total_time,
+                    parent_functions=parent_names[fid],
+                    child_functions=child_names[fid]
+                )
 
             self.total_time_ms = sum(m.total_time_ms for m in self.metrics.values())
             print(f"[✓] Parsed {len(self.metrics)} functions")
@@ -136,12 +153,16 @@ class PerformanceAnalyzer:
 
     def identify_bottlenecks(self) -> List[FunctionMetrics]:
         """Identify functions consuming most CPU time"""
-        hotspots = [
-            m for m in self.metrics.values()
-            if m.cpu_percentage >= self.threshold
-        ]
-        hotspots.sort(key=lambda x: x.cpu_percentage, reverse=True)
-        return hotspots
+        metrics = list(self.metrics.values())
+        if not metrics:
+            return []
+        # Threshold filter + descending sort in numpy — avoids one Python
+        # key-lambda call per function on large flamegraphs
+        pcts = np.fromiter((m.cpu_percentage for m in metrics),
+                           dtype=np.float32, count=len(metrics))
+        idx = np.flatnonzero(pcts >= self.threshold)
+        order = idx[np.argsort(-pcts[idx], kind='stable')]
+        return [metrics[i] for i in order]
 
     def compare_baseline(self, baseline_file: Path) -> Dict:
         """Compare against baseline for regression detection"""
@@ -279,8 +300,15 @@ class PerformanceAnalyzer:
                 'recommendations': self.generate_recommendations()
             }
 
-            with open(output_file, 'w') as f:
-                json.dump(analysis, f, indent=2, default=str)
+            try:
+                import orjson
+                with open(output_file, 'wb') as f:
+                    f.write(orjson.dumps(analysis,
+                                         option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+                                         default=str))
+            except ImportError:
+                with open(output_file, 'w') as f:
+                    json.dump(analysis, f, indent=2, default=str)
 
             print(f"[✓] Analysis exported: {output_file}")
             return True